@@ -4,29 +4,36 @@
 Copy all the files and folders, with preserving metadata such as dates, hidden attributes, etc.
 
 ## `progress.jsonl` structure:
-1. {source: Path, destination: Path, exclude: deque[str]}
-2. hardlinks: dict[Path, deque[Path]]
-3. extra_attrib_dirs: deque[Path]
-4. junction_dirs: deque[Path]
-5. {dirs: deque[Path], list_files: deque[Path], list_links: deque[Path]}
-6. (one per line) processed: deque[Path]
+1. {source: Path, destination: Path, exclude: list[str]}
+2. hardlinks: dict[Path, list[Path]]
+3. extra_attrib_dirs: list[Path]
+4. junction_dirs: list[Path]
+5. {dirs: list[Path], list_files: list[Path], list_links: list[Path]}
+6. (one per line) processed: list[Path]
 """
 
+from typing import BinaryIO
 from collections import deque
-from collections.abc import Sequence
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import contextlib
+from dataclasses import dataclass, field, fields
+import errno
 import fnmatch
-from itertools import islice
+from functools import partial
 import os
 from pathlib import Path
+import queue
+import re
 from shutil import Error as ShutilError
-from shutil import copy2, copystat, copytree
+from shutil import SameFileError, copyfileobj, copystat
 import stat
-from subprocess import run
+import struct
 import sys
+import threading
+import time
 
 import orjson
-from pydantic import BaseModel, Field
 from rich import inspect
 from rich.console import Console
 from rich.live import Live
@@ -34,19 +41,25 @@ from rich.markup import escape
 from rich.progress import BarColumn, DownloadColumn, MofNCompleteColumn, Progress, TaskID, TransferSpeedColumn
 from rich.status import Status as ConsoleStatus
 from rich.table import Table
+from rich.text import Text
 
 IS_WINDOWS = sys.platform == "win32"
 
 if IS_WINDOWS:
     import ctypes
-
-    from win32file import FindFileNames
+    from ctypes import wintypes
 
 
 # ? Const
 
 
 INVALID_FILE_ATTRIBUTES = -1
+GENERIC_WRITE = 0x40000000
+OPEN_EXISTING = 3
+FILE_FLAG_BACKUP_SEMANTICS = 0x02000000  # ? Required to open folders
+FILE_FLAG_OPEN_REPARSE_POINT = 0x00200000
+FSCTL_SET_REPARSE_POINT = 0x000900A4
+COPY_FILE_NO_BUFFERING = 0x00001000
 TRACKED_ATTRIBUTES = (
     stat.FILE_ATTRIBUTE_ARCHIVE
     # | stat.FILE_ATTRIBUTE_COMPRESSED # NOTE: require DeviceIoControl with FSCTL_SET_COMPRESSION
@@ -63,6 +76,45 @@ WINDOWS_DEFAULT_EXCLUDE: list[str] = [
     # f"System Volume Information{os.sep}*",
 ]
 
+SCAN_WORKERS = 16
+SCAN_IN_FLIGHT = SCAN_WORKERS * 4  # ? Max submitted folder listings, keeps listings held in memory bounded on wide trees
+FIXUP_WORKERS = 8  # ? Threads creating junctions, hardlinks and applying attributes after copy
+SCAN_STATUS_MASK = (1 << 10) - 1  # ? Scan status is updated every 1024 entries
+SCAN_STATUS_INTERVAL = 0.1  # ? Seconds after which scan status is updated between folders anyway (slow drives)
+COPY_WORKERS = 8
+COPY_IN_FLIGHT = COPY_WORKERS * 4  # ? Max submitted file copies, keeps scandir of next folders bounded ahead of copying
+PROGRESS_FLUSH_INTERVAL = 0.1  # ? Seconds between progress bar updates while copying, same as `Live` refresh rate
+PROCESSED_QUEUE_SIZE = 1 << 16
+PROCESSED_FLUSH_INTERVAL = 0.1  # ? Seconds between writes of processed paths
+COPY_CHUNK_SIZE = 1 << 30
+COPY_FILE_RANGE_FALLBACK_ERRNO = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}  # ? Not supported by kernel or between drives
+SENDFILE_FALLBACK_ERRNO = {errno.ENOSYS, errno.EINVAL, errno.ENOTSOCK, errno.EOPNOTSUPP}  # ? Not supported by kernel or file system
+COPY_UNBUFFERED_MIN_SIZE = 16 << 20  # ? Files larger than this are copied bypassing OS cache on Windows (`COPY_FILE_NO_BUFFERING`)
+
+if IS_WINDOWS:
+    kernel32 = ctypes.WinDLL("kernel32.dll", use_last_error=True)
+    kernel32.CopyFileExW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p, ctypes.c_void_p, ctypes.POINTER(wintypes.BOOL), wintypes.DWORD)
+    kernel32.CopyFileExW.restype = wintypes.BOOL
+    kernel32.CreateFileW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, ctypes.c_void_p, wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.DeviceIoControl.argtypes = (
+        wintypes.HANDLE,
+        wintypes.DWORD,
+        ctypes.c_void_p,
+        wintypes.DWORD,
+        ctypes.c_void_p,
+        wintypes.DWORD,
+        ctypes.POINTER(wintypes.DWORD),
+        ctypes.c_void_p,
+    )
+    kernel32.DeviceIoControl.restype = wintypes.BOOL
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+    kernel32.CloseHandle.restype = wintypes.BOOL
+    kernel32.SetFileAttributesW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD)
+    kernel32.SetFileAttributesW.restype = wintypes.BOOL
+
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
 progress_file = (Path(__file__) / ".." / "progress.jsonl").resolve()
 console = Console()
 
@@ -70,63 +122,229 @@ console = Console()
 # ? Model
 
 
-class ProgressContext(BaseModel):
+type ScanEntries = list[tuple[os.DirEntry[str], os.stat_result | None]]
+type PathTrie = dict[str | None, PathTrie]  # ? None key marks the end of excluded path
+
+
+@dataclass(slots=True)
+class ProgressContext:
     """
     Progress bar context
     """
 
-    main_progress: Progress = Field(..., title="Main progress bar")
-    files: TaskID = Field(..., title="Files progress bar ID")
-    dirs: TaskID = Field(..., title="Directories progress bar ID")
-    links: TaskID = Field(..., title="Links progress bar ID")
-    sub_progress: Progress = Field(..., title="Sub progress bar for file size")
-    size: TaskID = Field(..., title="Size progress bar ID")
-    table: Table = Field(..., title="Table for main and sub progress bar")
+    main_progress: Progress  # ? Main progress bar
+    files: TaskID  # ? Files progress bar ID
+    dirs: TaskID  # ? Directories progress bar ID
+    links: TaskID  # ? Links progress bar ID
+    sub_progress: Progress  # ? Sub progress bar for file size
+    size: TaskID  # ? Size progress bar ID
+    table: Table  # ? Table for main and sub progress bar
 
-    model_config = ConfigDict(arbitrary_types_allowed=True)
 
+@dataclass(slots=True)
+class IgnoreRule:
+    """
+    Excluded path precompiled for copy ignore controller
+    """
+
+    name_pattern: re.Pattern[str]  # ? Compiled pattern of last part of excluded path
+    path_parts: tuple[re.Pattern[str], ...]  # ? Compiled patterns of excluded path parts in reverse order (for folder pattern matching)
+    path_anchored: bool  # ? Excluded path has drive or root, so folder must match it by all parts
 
-class Context(BaseModel):
+
+@dataclass(slots=True)
+class IgnoreRules:
     """
-    Context for replication
+    Excluded paths precompiled for copy ignore controller
     """
 
-    source: Path = Field(..., title="Source directory")
-    len_source_parts: int = Field(..., title="Source parts length")
-    destination: Path = Field(..., title="Destination directory")
-    exclude: deque[str] = Field(..., title="Folders to exclude")
+    dirs: PathTrie = field(default_factory=dict)  # ? Trie of excluded absolute paths (keyed by normalized path parts, for strict check)
+    files: dict[str, set[str]] = field(default_factory=dict)  # ? Excluded absolute paths by parent folder (normalized names, for files matching)
+    file_patterns: dict[str, re.Pattern[str]] = field(default_factory=dict)  # ? Excluded wildcards by parent folder (union of name patterns, for files matching)
+    patterns: list[IgnoreRule] = field(default_factory=list)  # ? Excluded wildcards and relative paths
+    prefixes: tuple[str, ...] = ()  # ? Normalized `patterns` paths with trailing separator (for strict check of folder and its subfolders in one `str.startswith`)
+
+
+@dataclass(slots=True)
+class Context:
+    """
+    Context for replication
+    """
 
-    total_dirs: int = Field(default=1, title="Sum of total directories", description="Root directory is counted as well")
-    list_dirs: deque[str] = Field(default_factory=deque, title="Listing all directories")
-    total_files: int = Field(default=0, title="Sum ot total files", description="For progress bar")
-    total_size: int = Field(default=0, title="Sum of total files size", description="For progress bar")
-    sizes: dict[str, int] = Field(default={}, title="Sizes of individual files", description="For progress bar")
-    list_files: deque[str] = Field(default_factory=deque, title="Listing all files")
-    total_links: int = Field(default=0, title="Sum of total links", description="Hardlinks on 2nd+ occurance, symlinks, junction points")
-    list_links: deque[str] = Field(default_factory=deque, title="Listing all links", description="Hardlinks on 2nd+ occurance, symlinks, junction points")
-    current_dir: int = Field(default=0, title="Currend directory index")
-    current_file: int = Field(default=0, title="Current file index")
+    source: Path  # ? Source directory
+    len_source_parts: int  # ? Source parts length
+    destination: Path  # ? Destination directory
+    exclude: list[str]  # ? Folders to exclude
+    exclude_pattern: re.Pattern[str] | None = None  # ? Compiled `exclude` matcher of initial (user) excludes, built on init
+    excluded_paths: PathTrie = field(default_factory=dict)  # ? Paths excluded during scan (hardlinks on 2nd+ occurance, junction points)
+
+    total_dirs: int = 1  # ? Sum of total directories (root directory is counted as well)
+    list_dirs: list[str] = field(default_factory=list)  # ? Listing all directories
+    total_files: int = 0  # ? Sum ot total files (for progress bar)
+    total_size: int = 0  # ? Sum of total files size (for progress bar)
+    list_files: list[str] = field(default_factory=list)  # ? Listing all files
+    total_links: int = 0  # ? Sum of total links (hardlinks on 2nd+ occurance, symlinks, junction points)
+    list_links: list[str] = field(default_factory=list)  # ? Listing all links (hardlinks on 2nd+ occurance, symlinks, junction points)
+    current_dir: int = 0  # ? Currend directory index
+    current_file: int = 0  # ? Current file index
 
     # ? Metadata that is not being restored:
-    hardlinks: dict[Path, deque[Path]] = Field(default={}, title="Collection of hardlinks", description="Key is first occurrance, value is list of 2nd+ occurrances")
-    extra_attrib_dirs: deque[Path] = Field(default_factory=deque, title="List of folders with extra attributes", description="Archive, hidden, readonly, system attributes")
-    junction_dirs: deque[Path] = Field(default_factory=deque, title="List of junction directories", description="Require different execution to create")
-    oserrored: deque[Path] = Field(default_factory=deque, title="List of paths which was unable to replicate")
+    hardlinks: dict[Path, list[Path]] = field(default_factory=dict)  # ? Collection of hardlinks (key is first occurrance, value is list of 2nd+ occurrances)
+    inode_map: dict[tuple[int, int], Path] = field(default_factory=dict)  # ? First occurrance of hardlinked file (key is (st_dev, st_ino))
+    extra_attrib_dirs: list[Path] = field(default_factory=list)  # ? List of folders with extra attributes (archive, hidden, readonly, system attributes)
+    junction_dirs: list[Path] = field(default_factory=list)  # ? List of junction directories (require different execution to create)
+    oserrored: list[Path] = field(default_factory=list)  # ? List of paths which was unable to replicate
+    scan_errors: list[tuple[str, str]] = field(default_factory=list)  # ? Errors during scan (path, error), printed at once after scan
+
+    def __post_init__(self) -> None:
+        """
+        Compile initial excludes, kept when copied into `Context_Progressed`
+        """
 
-    processed: deque[str] = Field(default_factory=deque, title="Processed files", description="For dumping session")
+        if self.exclude_pattern is None:
+            self.exclude_pattern = compile_exclude(self.exclude)
 
 
+@dataclass(slots=True, kw_only=True)
 class Context_Progressed(Context):
     """
     Context for replication with progress
     """
 
-    progress: ProgressContext = Field(default=None, title="Progress bar context")
+    progress: ProgressContext  # ? Progress bar context
+    processed: queue.Queue[str | None]  # ? Processed paths (streamed to progress file by writer thread, None stops it)
+    processed_writer: threading.Thread  # ? Writer thread of processed paths
+    processed_errors: list[OSError]  # ? Errors of writer thread (reported on main thread once writer is stopped)
+
+    pending_dirs: int = 0  # ? Processed directories not yet shown on progress bar
+    pending_files: int = 0  # ? Copied files not yet shown on progress bar
+    pending_size: int = 0  # ? Copied size not yet shown on progress bar
+    last_flush: float = 0.0  # ? `time.monotonic()` of last progress bar update
 
 
 # ? Util
 
 
+def compile_exclude(exclude: Iterable[str], /) -> re.Pattern[str]:
+    """
+    Compile excluded paths into a single pattern matching any of them as substring
+
+    Empty exclude list compiles to a pattern that never matches, anchored so search rejects at first position instead of trying all of them
+    """
+
+    return re.compile("|".join(map(re.escape, exclude)) or r"\A(?!)")
+
+
+def split_path_key(path_key: str, /) -> list[str]:
+    """
+    Split normalized path into parts for `PathTrie`
+    """
+
+    return path_key.rstrip(os.sep).split(os.sep)  # noqa: PTH206
+
+
+def path_trie_insert(trie: PathTrie, path_key: str, /) -> None:
+    """
+    Insert normalized path into trie
+    """
+
+    node = trie
+    for part in split_path_key(path_key):
+        node = node.setdefault(part, {})
+    node[None] = {}
+
+
+def path_trie_has_prefix(trie: PathTrie, path_key: str, /) -> bool:
+    """
+    Check if normalized path is equal to or inside of any path in trie
+    """
+
+    node = trie
+    for part in split_path_key(path_key):
+        if None in node:
+            return True
+        if (next_node := node.get(part)) is None:
+            return False
+        node = next_node
+
+    return None in node
+
+
+def compile_ignore_rules(exclude: Iterable[str], /) -> IgnoreRules:
+    """
+    Precompile excluded paths for copy ignore controller
+
+    Absolute paths w/o wildcards (most of them, e.g. hardlinks and junctions) go to trie and per-folder name sets,
+    so their lookup does not depend on exclude count. Wildcard names are joined into one pattern per folder,
+    other matching is kept per excluded path.
+    Paths are normalized with `os.path.normcase`, name patterns are case insensitive on Windows same as `fnmatch`
+    """
+
+    flags = re.IGNORECASE if IS_WINDOWS else 0
+    rules = IgnoreRules()
+    name_patterns: dict[str, list[str]] = {}
+    prefixes: list[str] = []
+
+    for e in exclude:
+        pe = Path(e)
+        prefix = os.path.normcase(pe)
+        parent = os.path.normcase(pe.parent)
+
+        if pe.is_absolute() and not any(c in e for c in "*?["):
+            path_trie_insert(rules.dirs, prefix)
+            rules.files.setdefault(parent, set()).add(os.path.normcase(pe.parts[-1]))
+            continue
+
+        name_pattern = fnmatch.translate(pe.parts[-1])
+        name_patterns.setdefault(parent, []).append(name_pattern)
+        prefixes.append(prefix if prefix.endswith(os.sep) else prefix + os.sep)
+        rules.patterns.append(
+            IgnoreRule(
+                name_pattern=re.compile(name_pattern, flags),
+                path_parts=tuple(re.compile(fnmatch.translate(part), flags) for part in reversed(split_path_key(prefix))),
+                path_anchored=bool(pe.drive or pe.root),
+            ),
+        )
+
+    rules.prefixes = tuple(prefixes)
+    rules.file_patterns = {parent: re.compile("|".join(f"(?:{p})" for p in patterns), flags) for parent, patterns in name_patterns.items()}
+
+    return rules
+
+
+def ignore_rule_match_path(rule: IgnoreRule, path_parts: list[str], /) -> bool:
+    """
+    Match folder parts with excluded path pattern
+
+    Same as `PurePath.match`, but patterns of parts are compiled once instead of going through `fnmatch` cache for every folder
+    """
+
+    # ? First part of folder is its drive or root, it is matched only by anchored patterns
+    if len(path_parts) != len(rule.path_parts) if rule.path_anchored else len(path_parts) <= len(rule.path_parts):
+        return False
+
+    return all(pattern.match(part) for part, pattern in zip(reversed(path_parts), rule.path_parts, strict=False))
+
+
+def is_excluded(ctx: Context, str_path: str, /) -> bool:
+    """
+    Check if path contains any of initial excluded paths, or is equal to or inside of any path excluded during scan
+    """
+
+    return ctx.exclude_pattern.search(str_path) is not None or (bool(ctx.excluded_paths) and path_trie_has_prefix(ctx.excluded_paths, str_path))
+
+
+def exclude_scanned_path(ctx: Context, str_path: str, /) -> None:
+    """
+    Exclude path found during scan from rest of the scan and from copy
+
+    Trie insert keeps `exclude_pattern` as is, so it is not recompiled with growing `exclude` on every hardlink or junction
+    """
+
+    ctx.exclude.append(str_path)
+    path_trie_insert(ctx.excluded_paths, str_path)
+
+
 def confirm(text: str = "", /) -> bool:
     """
     Confirm dialog (case insensitive)
@@ -157,8 +375,13 @@ def init_progress(ctx: Context, /) -> Context_Progressed:
     progress_table.add_row(sub_progress)
     progress_table.add_row(progress)
 
+    processed: queue.Queue[str | None] = queue.Queue(maxsize=PROCESSED_QUEUE_SIZE)
+    processed_errors: list[OSError] = []
+    processed_writer = threading.Thread(target=write_progress_file_processed, args=(processed, processed_errors), name="processed-writer", daemon=True)
+    processed_writer.start()
+
     return Context_Progressed(
-        **ctx.model_dump(),
+        **{f.name: getattr(ctx, f.name) for f in fields(ctx)},
         progress=ProgressContext(
             main_progress=progress,
             files=progress_files,
@@ -168,31 +391,44 @@ def init_progress(ctx: Context, /) -> Context_Progressed:
             size=progress_size,
             table=progress_table,
         ),
+        processed=processed,
+        processed_writer=processed_writer,
+        processed_errors=processed_errors,
     )
 
 
-def has_hidden_attribute(path_stat: os.stat_result, /) -> bool:
+def flush_progress(ctx: Context_Progressed, /, *, force: bool = True) -> None:
     """
-    Check file or directory for hidden attribute
+    Advance progress bars by pending counters
+
+    Without `force` it is throttled to once per `PROGRESS_FLUSH_INTERVAL`
     """
 
-    return path_stat.st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN == stat.FILE_ATTRIBUTE_HIDDEN
+    now = time.monotonic()
+    if not force and now - ctx.last_flush < PROGRESS_FLUSH_INTERVAL:
+        return
+
+    ctx.last_flush = now
+    ctx.progress.main_progress.advance(ctx.progress.dirs, advance=ctx.pending_dirs)
+    ctx.progress.main_progress.advance(ctx.progress.files, advance=ctx.pending_files)
+    ctx.progress.sub_progress.advance(ctx.progress.size, advance=ctx.pending_size)
+    ctx.pending_dirs = ctx.pending_files = ctx.pending_size = 0
 
 
-def has_tracked_attributes(path_stat: os.stat_result, /) -> bool:
+def has_hidden_attribute(path_stat: os.stat_result, /) -> bool:
     """
-    Check file or directory for tracked attributes
+    Check file or directory for hidden attribute
     """
 
-    return path_stat.st_file_attributes & TRACKED_ATTRIBUTES != 0
+    return path_stat.st_file_attributes & stat.FILE_ATTRIBUTE_HIDDEN == stat.FILE_ATTRIBUTE_HIDDEN
 
 
-def is_hardlinked(path: Path, path_stat: os.stat_result, /) -> bool:
+def is_hardlinked(entry: os.DirEntry[str], path_stat: os.stat_result | None, /) -> bool:
     """
     Check if file have > 1 hardlinks
     """
 
-    return path.is_file() and path_stat.st_nlink > 1 and not path.is_symlink()
+    return entry.is_file(follow_symlinks=False) and path_stat.st_nlink > 1
 
 
 def are_hardlinked(p1: Path, p2: Path, /) -> bool:
@@ -200,25 +436,153 @@ def are_hardlinked(p1: Path, p2: Path, /) -> bool:
     Check if two files are hardlinked
     """
 
-    if not p1.is_file() or not p2.is_file():
+    # ? One stat per file, `is_file` and `samefile` would stat both files twice
+    try:
+        p1s, p2s = p1.stat(), p2.stat()
+    except OSError:
         return False
 
-    return p1.samefile(p2) or (((p1s := p1.stat()).st_ino == (p2s := p2.stat()).st_ino) and (p1s.st_dev == p2s.st_dev))
+    return stat.S_ISREG(p1s.st_mode) and stat.S_ISREG(p2s.st_mode) and p1s.st_ino == p2s.st_ino and p1s.st_dev == p2s.st_dev
+
+
+def entry_stat(entry: os.DirEntry[str], /) -> os.stat_result | None:
+    """
+    Stat of directory entry without following symlinks
+
+    Result is cached by `os.DirEntry`, on Windows it is filled from directory listing without extra syscall.
+    NOTE: Windows listing leaves `st_nlink` zeroed, so files still require `lstat` for hardlink detection
+    NOTE: outside of Windows stat of folders and symlinks is not used, they are not stat'ed and None is returned,
+    other entries (files and special files like FIFOs, sockets, devices) are counted as files, so they need size
+    """
+
+    if entry.is_file(follow_symlinks=False):
+        return os.lstat(entry.path) if IS_WINDOWS else entry.stat(follow_symlinks=False)
+
+    if IS_WINDOWS or not (entry.is_dir(follow_symlinks=False) or entry.is_symlink()):
+        return entry.stat(follow_symlinks=False)
+
+    return None
+
+
+def copy_file_content(fsrc: BinaryIO, fdst: BinaryIO, /) -> None:
+    """
+    Copy content between open files (Linux)
+
+    Tries in-kernel copy first: `os.copy_file_range` (reflink when supported), then `os.sendfile` (works between drives),
+    regular copy is used only when neither is supported and nothing was written yet
+    """
+
+    src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+
+    try:
+        while os.copy_file_range(src_fd, dst_fd, COPY_CHUNK_SIZE):
+            pass
+    except (AttributeError, OSError) as e:  # ? AttributeError: no `copy_file_range` on this platform
+        if getattr(e, "errno", errno.ENOSYS) not in COPY_FILE_RANGE_FALLBACK_ERRNO or fdst.tell():
+            raise
+    else:
+        return
+
+    try:
+        while os.sendfile(dst_fd, src_fd, None, COPY_CHUNK_SIZE):
+            pass
+    except (AttributeError, OSError) as e:  # ? AttributeError: no `sendfile` on this platform
+        if getattr(e, "errno", errno.ENOSYS) not in SENDFILE_FALLBACK_ERRNO or fdst.tell():
+            raise
+    else:
+        return
+
+    copyfileobj(fsrc, fdst, COPY_CHUNK_SIZE >> 10)
+
+
+def copy_file(source: str, destination: str, /, *, unbuffered: bool = False) -> os.stat_result | None:
+    """
+    Copy file content and stat without user-space buffer
+
+    * Windows: `CopyFileExW` copies content, attributes and modify date in one call, `unbuffered` skips OS cache for large files
+    * Linux: in-kernel copy with `copy_file_content`, mode, extended attributes and dates are set on open descriptor
+
+    Return stat of source when it was read for copy (Linux), None otherwise.
+    Raise `shutil.SameFileError` when destination is source itself or its hardlink (same as `shutil.copyfile`)
+    """
+
+    if IS_WINDOWS:
+        if not kernel32.CopyFileExW(source, destination, None, None, None, COPY_FILE_NO_BUFFERING if unbuffered else 0):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return None
+
+    # ? Destination is opened without truncation and truncated only once it is checked to be other file, otherwise source content is lost
+    with Path(source).open("rb", buffering=0) as fsrc, os.fdopen(os.open(destination, os.O_WRONLY | os.O_CREAT, 0o666), "wb", buffering=0) as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        src_stat = os.fstat(src_fd)
+
+        if os.path.samestat(src_stat, os.fstat(dst_fd)):
+            msg = f"{source!r} and {destination!r} are the same file"
+            raise SameFileError(msg)
+
+        os.ftruncate(dst_fd, 0)
+        copy_file_content(fsrc, fdst)
+
+        os.fchmod(dst_fd, stat.S_IMODE(src_stat.st_mode))
+        try:
+            xattr_names = os.listxattr(src_fd)
+        except OSError:  # ? Extended attributes not supported by file system
+            xattr_names = []
+        for name in xattr_names:
+            with contextlib.suppress(OSError):  # ? Same as `shutil._copyxattr`, not permitted attribute (e.g. `security.*`, `trusted.*`) is skipped alone
+                os.setxattr(dst_fd, name, os.getxattr(src_fd, name))
+        os.utime(dst_fd, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+
+    return src_stat
 
 
-def list_hardlinks_windows(p: Path | str | bytes, /) -> deque[Path]:
+def mount_point_reparse_data(source: Path, /) -> bytes:
     """
-    Return list of hardlinks for a given file (Windows)
+    Pack `REPARSE_DATA_BUFFER` of mount point (junction) targeting `source`
     """
 
-    return deque(Path(f).absolute() for f in FindFileNames(os.fsdecode(os.fspath(p))))
+    target = str(source.absolute()).removeprefix("\\\\?\\")
+    substitute_name = ("\\??\\" + target).encode("utf-16-le")
+    print_name = target.encode("utf-16-le")
+    path_buffer = substitute_name + b"\0\0" + print_name + b"\0\0"
+
+    return (
+        struct.pack(
+            "<IHHHHHH",
+            stat.IO_REPARSE_TAG_MOUNT_POINT,
+            8 + len(path_buffer),  # ? ReparseDataLength: name offsets and lengths + path buffer
+            0,
+            0,
+            len(substitute_name),
+            len(substitute_name) + 2,
+            len(print_name),
+        )
+        + path_buffer
+    )
 
 
-def create_junction_point(source: Path, destination: Path, /) -> int:
+def set_reparse_point(path: Path, reparse_data: bytes, /) -> None:
+    """
+    Set reparse point on existing empty folder (Windows)
+    """
+
+    handle = kernel32.CreateFileW(str(path), GENERIC_WRITE, 0, None, OPEN_EXISTING, FILE_FLAG_OPEN_REPARSE_POINT | FILE_FLAG_BACKUP_SEMANTICS, None)
+    if handle == INVALID_HANDLE_VALUE:
+        raise ctypes.WinError(ctypes.get_last_error())
+
+    try:
+        if not kernel32.DeviceIoControl(handle, FSCTL_SET_REPARSE_POINT, reparse_data, len(reparse_data), None, 0, ctypes.byref(wintypes.DWORD()), None):
+            raise ctypes.WinError(ctypes.get_last_error())
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def create_junction_point(source: Path, destination: Path, /) -> None:
     """
     Create Junction Point (reparse point)
 
-    Only NTFS supports Junction Points
+    Only NTFS supports Junction Points.
+    Reparse point is set in-process with `DeviceIoControl` instead of spawning `mklink` per junction
     """
 
     if not source.is_dir():
@@ -228,82 +592,55 @@ def create_junction_point(source: Path, destination: Path, /) -> int:
         msg = "Destination is not empty"
         raise OSError(msg)
 
-    return run(["cmd", "/c", "mklink", "/J", destination, source], check=True).returncode  # noqa: S603, S607
+    destination.mkdir()
+    try:
+        set_reparse_point(destination, mount_point_reparse_data(source))
+    except OSError:
+        destination.rmdir()
+        raise
 
 
 # ? Supplimentary replication functions
 # * Collecting metadata about file or directory
 
 
-def collect_metadata_hardlinks(ctx: Context, path: Path, /, path_stat: os.stat_result) -> bool:
+def collect_metadata_hardlinks(ctx: Context, entry: os.DirEntry[str], str_path: str, /, path_stat: os.stat_result | None) -> bool:
     """
     Collect metadata for hardlinks
+
+    Hardlinks are grouped by (st_dev, st_ino), 2nd+ occurrances are excluded from copy and linked afterwards
     """
 
-    if (path_is_hardlinked := is_hardlinked(path, path_stat)) and not any(path in hl for hl in ctx.hardlinks.values()):
-        _hardlinks = list_hardlinks_windows(path) if IS_WINDOWS else deque((path,))  # TODO: add Linux detection
-        ctx.hardlinks[path] = _hardlinks
-        ctx.exclude.extend(str(hl) for hl in _hardlinks if hl != path)
+    if not (path_is_hardlinked := is_hardlinked(entry, path_stat)):
+        return path_is_hardlinked
+
+    path = Path(str_path)
+    key = (path_stat.st_dev, path_stat.st_ino)
+    if (hl_source := ctx.inode_map.get(key)) is None:
+        ctx.inode_map[key] = path
+        ctx.hardlinks[path] = [path]
+    else:
+        ctx.hardlinks[hl_source].append(path)
+        exclude_scanned_path(ctx, str_path)
 
     return path_is_hardlinked
 
 
-def collect_metadata_tracked_attributes(
-    ctx: Context,
-    path: Path,
-    str_path: str,
-    path_stat: os.stat_result,
-    *,
-    path_is_hardlinked: bool,
-    is_junction: bool,
-    is_dir: bool = False,
-) -> bool:
+def collect_metadata_tracked_attributes(ctx: Context, str_path: str, path_stat: os.stat_result, /, *, is_dir: bool = False) -> None:
     """
     Collect metadata for tracked attributes (Windows)
 
-    Return False when should be aborted
+    Only called on Windows, stat is already taken (and its errors reported) before, so only folders attributes are checked here
     """
 
-    try:  # ? Broken symlinks can't get attributes, raise FileNotFoundError | (is_hidden := )
-        if (IS_WINDOWS and has_tracked_attributes(path_stat)) and is_dir:
-            ctx.extra_attrib_dirs.append(path)
-    except FileNotFoundError:
-        if path_is_hardlinked:
-            _hardlinks = ctx.hardlinks[path]
-            for hl in _hardlinks:
-                ctx.exclude.remove(str(hl))
-            del ctx.hardlinks[path]
-
-        if is_junction:
-            ctx.junction_dirs.remove(path)
-            ctx.exclude.remove(str_path)
-
-        return False
-
-    except OSError:
-        if path_is_hardlinked:
-            _hardlinks = ctx.hardlinks[path]
-            for hl in _hardlinks:
-                ctx.exclude.remove(str(hl))
-            del ctx.hardlinks[path]
-
-        if is_junction:
-            ctx.junction_dirs.remove(path)
-            ctx.exclude.remove(str_path)
-
-        ctx.oserrored.append(path)
-        console.print_exception(max_frames=1)
-
-        return False
-
-    return True
+    if is_dir and path_stat.st_file_attributes & TRACKED_ATTRIBUTES:
+        ctx.extra_attrib_dirs.append(Path(str_path))
 
 
 def collect_metadata_assign_path_type(
     ctx: Context,
-    path: Path,
     str_path: str,
-    path_stat: os.stat_result,
+    path_stat: os.stat_result | None,
     *,
     path_is_hardlinked: bool,
     is_symlink_or_junction: bool,
@@ -317,216 +654,400 @@ def collect_metadata_assign_path_type(
         case True, False, _:
             ctx.total_dirs += 1
             ctx.list_dirs.append(str_path)
-        case True, True, _:
-            ctx.total_links += 1
-            ctx.list_links.append(str_path)
-        case False, False, False:
+        case False, False, hardlinked if not hardlinked or Path(str_path) in ctx.hardlinks:  # ? Files, 1st occurrance of hardlink is copied as file
+            size = path_stat.st_size
             ctx.total_files += 1
             ctx.list_files.append(str_path)
-            ctx.total_size += path_stat.st_size
-            ctx.sizes[str(path)] = path_stat.st_size
-        case False, _, True:
-            if path in ctx.hardlinks:
-                ctx.total_files += 1
-                ctx.list_files.append(str_path)
-                ctx.total_size += path_stat.st_size
-                ctx.sizes[str(path)] = path_stat.st_size
-            else:
-                ctx.total_links += 1
-                ctx.list_links.append(str_path)
-                ctx.sizes[str(path)] = path_stat.st_size
-        case False, True, _:
+            ctx.total_size += size
+        case _:  # ? Symlinks, junctions, 2nd+ occurrances of hardlinks
             ctx.total_links += 1
             ctx.list_links.append(str_path)
-            ctx.sizes[str(path)] = path_stat.st_size
 
 
-def collect_metadata(ctx: Context, path: Path, /, is_dir: bool = False) -> None:
+def collect_metadata(ctx: Context, entry: os.DirEntry[str], /, path_stat: os.stat_result | None = None) -> None:
     """
     Collect metadata that is not restored by shutil
 
+    File type and stat are taken from `os.DirEntry` cache instead of querying path again,
+    `path_stat` is prefetched by scanner thread (otherwise taken from entry)
+
     * hardlinks treated as files, this make it creating duplication instead of creating hardlinks
-        NOTE: detection for hardlinks rely on Windows win32 function, Linux alternative is not implemented
     * folders didn't restore attributes like hidden, system, etc
     * junction points created as regular folders and all content in them are duplicated
+
+    `Path` is only built for entries stored as such (hardlinks, junctions, folders with attributes, errors), others stay `str`
     """
 
     # NOTE: pattern matching is very slow here, uses fnmatch.translate a lot of the time
     # if any(path.match(e) for e in exclude):
     #     return
 
-    str_path = str(path)
+    str_path = entry.path
 
-    # NOTE: faster alternative w/o pattern matching
-    if any(e in str_path for e in ctx.exclude):
+    # NOTE: faster alternative w/o pattern matching, all excluded paths are tested in one regex pass
+    if is_excluded(ctx, str_path):
         return
 
-    path_stat: os.stat_result = path.stat(follow_symlinks=False)
+    is_dir = entry.is_dir(follow_symlinks=False)
 
     try:
-        path_is_hardlinked = collect_metadata_hardlinks(ctx, path, path_stat)
-    except OSError:
-        ctx.oserrored.append(path)
-        console.print_exception(max_frames=1)
+        path_stat = path_stat or entry_stat(entry)
+        path_is_hardlinked = collect_metadata_hardlinks(ctx, entry, str_path, path_stat)
+    except OSError as e:
+        ctx.oserrored.append(Path(str_path))
+        ctx.scan_errors.append((str_path, f"{type(e).__name__}: {e}"))
         return
 
-    is_symlink = path.is_symlink()
-    is_junction = path.is_junction()
+    # ? Only reparse points can be symlinks or junctions on Windows, there are no junctions elsewhere
+    if IS_WINDOWS and not path_stat.st_file_attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+        is_symlink = is_junction = False
+    else:
+        is_symlink = entry.is_symlink()
+        is_junction = IS_WINDOWS and entry.is_junction()
     is_symlink_or_junction = is_symlink or is_junction
     if is_junction:
-        ctx.junction_dirs.append(path)
-        ctx.exclude.append(str_path)
+        ctx.junction_dirs.append(Path(str_path))
+        exclude_scanned_path(ctx, str_path)
 
-    if not collect_metadata_tracked_attributes(ctx, path, str_path, path_stat, path_is_hardlinked=path_is_hardlinked, is_junction=is_junction, is_dir=is_dir):
-        return
+    # ? No file attributes outside of Windows, call is skipped entirely
+    if IS_WINDOWS:
+        collect_metadata_tracked_attributes(ctx, str_path, path_stat, is_dir=is_dir)
 
-    collect_metadata_assign_path_type(ctx, path, str_path, path_stat, path_is_hardlinked=path_is_hardlinked, is_symlink_or_junction=is_symlink_or_junction, is_dir=is_dir)
+    collect_metadata_assign_path_type(ctx, str_path, path_stat, path_is_hardlinked=path_is_hardlinked, is_symlink_or_junction=is_symlink_or_junction, is_dir=is_dir)
 
 
 # * Scan directory for files
 
 
-def _scan_windows_dir(ctx: Context, /, status: ConsoleStatus) -> None:
+def scan_dir_entries(root: str, /, *, skip_mounts: bool = False) -> ScanEntries:
     """
-    Scan directory (Windows)
+    List folder with `os.scandir` and stat entries with `entry_stat`
+
+    On Windows `os.scandir` lists with `FindFirstFileW` / `FindNextFileW`, type checks and folder stat are served from listing data,
+    so only files need extra `lstat` for `st_nlink` (not returned by any of `FindFirstFileExW` info levels either).
+    Stat is None when it failed (or is not needed), it is retried in `collect_metadata` to report an error
     """
 
-    for root, dirs, files in ctx.source.walk(top_down=True, follow_symlinks=False):
-        for name in dirs:
-            collect_metadata(ctx, root / name, is_dir=True)
+    try:
+        scandir_it = os.scandir(root)
+    except OSError:
+        return []
 
-            ctx.current_dir += 1
-            status.update(f"Scanning... Dirs: [bold blue]{ctx.current_dir}[/bold blue] Files: [bold blue]{
-                ctx.current_file}[/bold blue] | [yellow]{escape(str(root / name))}[/yellow]")
+    entries: ScanEntries = []
+    with scandir_it:
+        for entry in scandir_it:
+            if skip_mounts and entry.is_dir(follow_symlinks=False) and os.path.ismount(entry.path):
+                continue
 
-        for name in files:
-            collect_metadata(ctx, root / name)
+            try:
+                path_stat = entry_stat(entry)
+            except OSError:
+                path_stat = None
+            entries.append((entry, path_stat))
 
-            ctx.current_file += 1
-            status.update(f"Scanning... Dirs: [bold blue]{ctx.current_dir}[/bold blue] Files: [bold blue]{
-                ctx.current_file}[/bold blue] | [yellow]{escape(str(root / name))}[/yellow]")
+    return entries
 
-        # NOTE: while this is more performant, some directories take too long to update, so moving update to loops above
-        # current_dir += len(dirs)
-        # current_file += len(files)
-        # status.update(f"Scanning... Dirs: [bold blue]{ctx.current_dir}[/bold blue] Files: [bold blue]{
-        #     ctx.current_file}[/bold blue] | [yellow]{escape(str(root))}[/yellow]")
 
+def update_scan_status(ctx: Context, status: ConsoleStatus, path: str, /) -> None:
+    """
+    Render scan status
 
-def _scan_linux_dir(ctx: Context, /, status: ConsoleStatus) -> None:
+    Status text is assembled from styled parts, so path is neither escaped nor parsed as markup
     """
-    Scan directory (Linux)
 
-    ? Exclude mount points on Linux systems
+    status.update(
+        Text.assemble(
+            "Scanning... Dirs: ",
+            (str(ctx.current_dir), "bold blue"),
+            " Files: ",
+            (str(ctx.current_file), "bold blue"),
+            " | ",
+            (path, "yellow"),
+        ),
+    )
+
+
+def _collect_entries(ctx: Context, entries: ScanEntries, /, status: ConsoleStatus) -> list[str]:
     """
+    Collect metadata of scanned entries
 
-    for root, dirs, files in ctx.source.walk(top_down=True, follow_symlinks=False):
-        for name in dirs:
-            if (root / name).is_mount():
-                dirs[:] = [d for d in dirs if d != name]
-                continue
+    Status is rendered every 1024 entries, not per entry.
+    Return subfolders to walk: excluded folders and junctions (excluded once collected) are not walked, as all their content is excluded
+    """
+
+    # ? Counters are kept in locals and stored to context only when status is rendered and at the end
+    current_dir, current_file = ctx.current_dir, ctx.current_file
+    subdirs: list[str] = []
+    append_subdir = subdirs.append
 
-            collect_metadata(ctx, root / name, is_dir=True)
+    for entry, path_stat in entries:
+        collect_metadata(ctx, entry, path_stat)
 
-            ctx.current_dir += 1
-            status.update(f"Scanning... Dirs: [bold blue]{ctx.current_dir}[/bold blue] Files: [bold blue]{
-                ctx.current_file}[/bold blue] | [yellow]{escape(str(root / name))}[/yellow]")
+        if entry.is_dir(follow_symlinks=False):
+            current_dir += 1
+            if not is_excluded(ctx, entry.path):
+                append_subdir(entry.path)
+        else:
+            current_file += 1
+
+        if not (current_dir + current_file) & SCAN_STATUS_MASK:
+            ctx.current_dir, ctx.current_file = current_dir, current_file
+            update_scan_status(ctx, status, entry.path)
 
-        for name in files:
-            collect_metadata(ctx, root / name)
+    ctx.current_dir, ctx.current_file = current_dir, current_file
 
-            ctx.current_file += 1
-            status.update(f"Scanning... Dirs: [bold blue]{ctx.current_dir}[/bold blue] Files: [bold blue]{
-                ctx.current_file}[/bold blue] | [yellow]{escape(str(root / name))}[/yellow]")
+    return subdirs
 
 
 def scan_dir(ctx: Context, /) -> None:
     """
     Scan directory
+
+    Folders are listed by thread pool ahead of collecting, to overlap syscall latency of many folders,
+    metadata is collected on main thread in breadth-first order, since it shares `exclude` and `hardlinks` between subtrees.
+    Folders waiting for listing are kept as paths, only up to `SCAN_IN_FLIGHT` listings are submitted at once.
+    ? Exclude mount points on Linux systems
     """
 
-    with console.status("Scanning... Dirs: 0 Files: 0") as status:
-        if IS_WINDOWS:
-            _scan_windows_dir(ctx, status=status)
-        else:
-            _scan_linux_dir(ctx, status=status)
+    scan = partial(scan_dir_entries, skip_mounts=not IS_WINDOWS)
+    last_path = str(ctx.source)
+    last_update = time.monotonic()
+
+    with console.status("Scanning... Dirs: 0 Files: 0") as status, ThreadPoolExecutor(max_workers=SCAN_WORKERS, thread_name_prefix="scan") as executor:
+        pending_dirs: deque[str] = deque((last_path,))
+        pending: deque[Future[ScanEntries]] = deque()
+
+        try:
+            while pending_dirs or pending:
+                while pending_dirs and len(pending) < SCAN_IN_FLIGHT:
+                    pending.append(executor.submit(scan, pending_dirs.popleft()))
+
+                entries = pending.popleft().result()
+                pending_dirs.extend(_collect_entries(ctx, entries, status=status))
+
+                if entries:
+                    last_path = entries[-1][0].path
+
+                # ? Checked once per folder, so slow listing still shows progress while staying off per entry path
+                if (now := time.monotonic()) - last_update >= SCAN_STATUS_INTERVAL:
+                    update_scan_status(ctx, status, last_path)
+                    last_update = now
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        finally:
+            update_scan_status(ctx, status, last_path)
+
+
+def print_scan_errors(ctx: Context, /) -> None:
+    """
+    Print errors collected during scan as one table
+
+    Errors are not printed while scanning, so paths with denied access do not slow it down with traceback rendering
+    """
+
+    table = Table(title="OS Errors", title_style="red")
+    table.add_column("Path", style="yellow", overflow="fold")
+    table.add_column("Error", style="red")
+
+    for path, error in ctx.scan_errors:
+        table.add_row(path, error)
+
+    console.print(table)
 
 
 # * Copy files and directories
 
 
-def copy_tree_ignore_controller(ctx: Context_Progressed, path: str, files: Sequence[str]) -> set[str]:
+def copy_tree_ignore_controller(ctx: Context_Progressed, path: str, files: Sequence[str], rules: IgnoreRules) -> set[str]:
     """
     Ignore controller
 
     Argument `path` is a root to current working directory
     and `files` is a list of file names (without directory path) in that folder.
+    Argument `rules` is `ctx.exclude` precompiled with `compile_ignore_rules`.
     Return would be an iterable of files to ignore.
     """
 
-    temp_exclude: deque[str] = deque()
-    p = Path(path)
-
-    for e in ctx.exclude:
-        pe = Path(e)
-        last_part = pe.parts[-1]
-
-        # ? Strict check (directory path is equal to excluded directory)
-        # Example: path: D:\test, exc: D:\test or path: D:\test\sub, exc: D:\test
-        if p.is_relative_to(e):
-            temp_exclude.extend(files)
+    temp_exclude: set[str] = set()
+    path_key = os.path.normcase(path)
+    path_prefix = path_key if path_key.endswith(os.sep) else path_key + os.sep
 
-        # ? Pattern matching (with *)
-        # Example: path: D:\test with some files and exc: D:\test\*.txt
-        elif p.match(e):
-            temp_exclude.extend(fnmatch.filter(files, last_part))  # TODO: replace for faster alternative (fnmatch.translate is slow)
+    # ? Strict check (directory path is equal to excluded directory)
+    # Example: path: D:\test, exc: D:\test or path: D:\test\sub, exc: D:\test
+    if path_trie_has_prefix(rules.dirs, path_key) or path_prefix.startswith(rules.prefixes):
+        temp_exclude.update(files)
 
+    else:
         # ? Files matching
         # Example: exc: D:\test\1.txt, path: D:\test, files ["1.txt", "2.txt"]
-        elif pe.parent == p and (_files := fnmatch.filter(files, last_part)):  # TODO: same
-            temp_exclude.extend(_files)
+        # Example: exc: D:\test\*.txt, path: D:\test, files ["1.txt", "2.log"]
+        if (names := rules.files.get(path_key)) and IS_WINDOWS:
+            temp_exclude.update(f for f in files if os.path.normcase(f) in names)
+        elif names:  # ? Names are not case normalized outside of Windows, so set intersection is enough
+            temp_exclude.update(names.intersection(files))
+        if name_pattern := rules.file_patterns.get(path_key):
+            temp_exclude.update(filter(name_pattern.match, files))
+
+        # ? Pattern matching (with *) of folder itself
+        # Example: path: D:\test\sub with some files and exc: D:\*\sub
+        path_parts = split_path_key(path_key) if rules.patterns else []
+        for rule in rules.patterns:
+            if ignore_rule_match_path(rule, path_parts):
+                temp_exclude.update(filter(rule.name_pattern.match, files))
 
     # progress.console.print(f"\nProcessing path: {path!r} Files:", files, "Path excluded:", path in exclude, _exclude)
     # input()
-    to_be_processed = [(p / f) for f in files if f not in temp_exclude]
-    ctx.processed.extend(map(str, to_be_processed))
-    ctx.progress.main_progress.advance(ctx.progress.dirs, advance=1)
+    ctx.pending_dirs += 1
+    flush_progress(ctx, force=False)
     # NOTE: moved to copy2 function
     # progress.advance(progress_files, advance=len([f for f in to_be_processed if f.is_file()]))
 
-    return set(temp_exclude)
+    return temp_exclude
 
 
-def copy_tree_copy_controller(ctx: Context_Progressed, source: str, destination: str, *, follow_symlinks: bool = True) -> str:
+def copy_tree_copy_file(entry: os.DirEntry[str], destination: str, /) -> int:
+    """
+    Copy file of directory entry, return its size for progress
+
+    Size is taken from stat of opened source, or from `os.DirEntry` cache (filled by listing on Windows), so it is not kept from scan
+    """
+
+    if IS_WINDOWS:
+        size = entry.stat(follow_symlinks=False).st_size
+        copy_file(entry.path, destination, unbuffered=size > COPY_UNBUFFERED_MIN_SIZE)
+        return size
+
+    return (copy_file(entry.path, destination) or entry.stat(follow_symlinks=False)).st_size
+
+
+def copy_tree_copy_controller(executor: ThreadPoolExecutor, pending: dict[Future[int], tuple[str, str]], entry: os.DirEntry[str], destination: str) -> None:
     """
     Copy controller
 
-    For every file this function would be called with absolute paths for `source` and `destination`.
-    Folders does not created with this function.
+    For every file this function would be called with directory entry of `source` and absolute path of `destination`.
+    Folders and symlinks does not created with this function.
+    Copy is submitted to `executor`, so reads and writes of several files overlap; progress is advanced by `copy_tree_reap_copies`.
     """
 
-    ctx.progress.main_progress.advance(ctx.progress.files, advance=1)
-    ctx.progress.sub_progress.advance(ctx.progress.size, advance=ctx.sizes[source])
-    # ctx.progress.main_progress.console.print(f'Copying: "{escape(source)}"') # → "{destination}"
+    # ctx.progress.main_progress.console.print(f'Copying: "{escape(entry.path)}"') # → "{destination}"
+    pending[executor.submit(copy_tree_copy_file, entry, destination)] = (entry.path, destination)
 
-    return copy2(source, destination, follow_symlinks=follow_symlinks)
 
+def copy_tree_reap_copies(
+    ctx: Context_Progressed,
+    pending: dict[Future[int], tuple[str, str]],
+    errors: list[tuple[str, str, str]],
+    /,
+    return_when: str = FIRST_COMPLETED,
+) -> None:
+    """
+    Wait for submitted copies and account finished ones
 
-def copy_tree(ctx: Context_Progressed, /, dir_exist_ok: bool = True) -> None:
+    Progress counters and processed queue are only touched here, from the main thread.
     """
-    Copy tree with progress
+
+    if not pending:
+        return
+
+    done, _ = wait(pending, return_when=return_when)
+    for future in done:
+        source, destination = pending.pop(future)
+        ctx.pending_files += 1
+
+        try:
+            ctx.pending_size += future.result()
+        except OSError as e:
+            errors.append((source, destination, str(e)))
+        else:
+            ctx.processed.put(source)
+
+    flush_progress(ctx, force=False)
+
+
+def _copy_tree(ctx: Context_Progressed, /, dir_exist_ok: bool) -> None:  # noqa: C901
     """
+    Copy tree iteratively with `os.scandir` stack
+
+    Follows `shutil.copytree(symlinks=True)`: symlinks are recreated, junctions are walked as folders, special files are reported as errors,
+    folder stats are copied after their content, errors are collected and raised at the end as `shutil.Error`.
+    """
+
+    errors: list[tuple[str, str, str]] = []
+    rules = compile_ignore_rules(ctx.exclude)
+    ctx.destination.mkdir(parents=True, exist_ok=dir_exist_ok)
+    copied_dirs: list[tuple[str, Path]] = [(str(ctx.source), ctx.destination)]
+    stack: list[tuple[str, Path]] = [(str(ctx.source), ctx.destination)]
+    pending: dict[Future[int], tuple[str, str]] = {}
+    executor = ThreadPoolExecutor(max_workers=COPY_WORKERS, thread_name_prefix="copy")
+
+    try:
+        while stack:
+            src_root, dst_root = stack.pop()
+            try:
+                with os.scandir(src_root) as scandir_it:
+                    entries = list(scandir_it)
+            except OSError as e:
+                errors.append((src_root, str(dst_root), str(e)))
+                continue
+
+            ignored = copy_tree_ignore_controller(ctx, src_root, [entry.name for entry in entries], rules)
+
+            dirs: list[tuple[str, Path]] = []
+            for entry in entries:
+                if entry.name in ignored:
+                    continue
+
+                dst = dst_root / entry.name
+                try:
+                    if entry.is_symlink():
+                        dst.symlink_to(Path(entry.path).readlink(), target_is_directory=entry.is_dir())
+                        copystat(entry.path, dst, follow_symlinks=False)
+                    elif entry.is_dir(follow_symlinks=False):
+                        dst.mkdir(exist_ok=dir_exist_ok)
+                        dirs.append((entry.path, dst))
+                    elif not entry.is_file(follow_symlinks=False):  # ? Same as `shutil.copyfile`, special files (FIFOs, sockets, devices) are not read
+                        errors.append((entry.path, str(dst), f"`{entry.path}` is not a regular file"))
+                        ctx.pending_files += 1  # ? Counted same as failed copy, errors are subtracted from files progress afterwards
+                        continue
+                    else:
+                        while len(pending) >= COPY_IN_FLIGHT:
+                            copy_tree_reap_copies(ctx, pending, errors)
+                        copy_tree_copy_controller(executor, pending, entry, str(dst))
+                        continue
+                except OSError as e:
+                    errors.append((entry.path, str(dst), str(e)))
+                else:
+                    ctx.processed.put(entry.path)
+
+            copied_dirs.extend(dirs)
+            stack.extend(reversed(dirs))
+
+        copy_tree_reap_copies(ctx, pending, errors, return_when=ALL_COMPLETED)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    flush_progress(ctx)
+
+    # ? Children first, so content copy does not change folder modify date afterwards
+    for src_dir, dst_dir in reversed(copied_dirs):
+        try:
+            copystat(src_dir, dst_dir)
+        except OSError as e:
+            if getattr(e, "winerror", None) is None:  # ? Same as shutil.copytree, Windows errors on copying stat are ignored
+                errors.append((src_dir, str(dst_dir), str(e)))
 
-    def _ignore_controller(path: str, files: Sequence[str]) -> set[str]:
-        nonlocal ctx
-        return copy_tree_ignore_controller(ctx, path, files)
+    if errors:
+        raise ShutilError(errors)
 
-    def _copy_controller(source: str, destination: str, *, follow_symlinks: bool = True) -> str:
-        nonlocal ctx
-        return copy_tree_copy_controller(ctx, source, destination, follow_symlinks=follow_symlinks)
+
+def copy_tree(ctx: Context_Progressed, /, dir_exist_ok: bool = True) -> None:
+    """
+    Copy tree with progress
+    """
 
     try:
-        copytree(ctx.source, ctx.destination, symlinks=True, ignore=_ignore_controller, copy_function=_copy_controller, ignore_dangling_symlinks=True, dirs_exist_ok=dir_exist_ok)
+        _copy_tree(ctx, dir_exist_ok=dir_exist_ok)
     except FileExistsError as e:
         inspect(e)
     except ShutilError as e:
@@ -538,95 +1059,159 @@ def copy_tree(ctx: Context_Progressed, /, dir_exist_ok: bool = True) -> None:
 
         for f, er in error_files.items():
             ctx.progress.main_progress.console.print(f"{f}:", er, style="red")
-            with contextlib.suppress(ValueError):
-                ctx.processed.remove(f)
 
         ctx.progress.main_progress.console.print()
     except KeyboardInterrupt:
         ctx.progress.main_progress.console.print("Cancelling task. You can restart program and continue from latest file.", style="blue")
-
-        with progress_file.open(mode="a", encoding="utf-8") as f:
-            f.writelines(p + "\n" for p in islice(ctx.processed, len(ctx.processed) - 1))
-
         raise
+    finally:
+        flush_progress(ctx)
+        ctx.processed.put(None)
+        ctx.processed_writer.join()
+
+        for e in ctx.processed_errors:
+            ctx.progress.main_progress.console.print("Progress file write error, continuation would copy some files again:", e, style="red")
 
 
 # * Apply attributes, create links
 
 
-def apply_windows_attributes(ctx: Context_Progressed, /, kernel32: ctypes.WinDLL) -> None:
+def apply_windows_attributes(ctx: Context_Progressed, /, kernel32: "ctypes.WinDLL") -> None:
     """
     Apply Windows attributes (NTFS)
+
+    Attributes are set from thread pool, results (and errors) are reported on main thread in original order
     """
 
-    for folder in ctx.extra_attrib_dirs:
-        attrs = folder.stat(follow_symlinks=False).st_file_attributes
-        target = Path(ctx.destination, *folder.parts[ctx.len_source_parts :])
+    set_file_attributes = kernel32.SetFileAttributesW
+    source_str_len = len(str(ctx.source).rstrip(os.sep))
+    destination_str = str(ctx.destination).rstrip(os.sep)
 
-        if kernel32.SetFileAttributesW(str(target), attrs):
-            ctx.progress.main_progress.console.print(f"Copy stat from {folder!r} to {target!r}: {attrs}")
-            # ctx.progress.main_progress.advance(progress_links, advance=1)
-        else:
-            ctx.oserrored.append(folder)
-            ctx.progress.main_progress.console.print(f"Copy stat error at {target!r}", style="red")
+    def apply_attributes(folder: Path, /) -> tuple[str, int, OSError | None]:
+        attrs = 0
+        target = destination_str + str(folder)[source_str_len:]
+
+        try:
+            attrs = folder.stat(follow_symlinks=False).st_file_attributes
+            if not set_file_attributes(target, attrs):
+                raise ctypes.WinError(ctypes.get_last_error())
+        except OSError as e:
+            return target, attrs, e
+
+        return target, attrs, None
+
+    with ThreadPoolExecutor(max_workers=FIXUP_WORKERS) as executor:
+        for folder, (target, attrs, error) in zip(ctx.extra_attrib_dirs, executor.map(apply_attributes, ctx.extra_attrib_dirs), strict=True):
+            if error is None:
+                ctx.progress.main_progress.console.print(f"Copy stat from {folder!r} to {target!r}: {attrs}")
+                # ctx.progress.main_progress.advance(progress_links, advance=1)
+            else:
+                ctx.oserrored.append(folder)
+                ctx.progress.main_progress.console.print("Copy stat error:", error, f"at {target!r}", style="red")
 
-        # if (attrs := kernel32.GetFileAttributesW(str(target))) == INVALID_FILE_ATTRIBUTES:
-        #     raise ctypes.WinError(ctypes.get_last_error())
-        #     continue
+            # if (attrs := kernel32.GetFileAttributesW(str(target))) == INVALID_FILE_ATTRIBUTES:
+            #     raise ctypes.WinError(ctypes.get_last_error())
+            #     continue
 
-        # attrs |= stat.FILE_ATTRIBUTE_HIDDEN
-        # if not kernel32.SetFileAttributesW(target, attrs):
-        #     raise ctypes.WinError(ctypes.get_last_error())
+            # attrs |= stat.FILE_ATTRIBUTE_HIDDEN
+            # if not kernel32.SetFileAttributesW(target, attrs):
+            #     raise ctypes.WinError(ctypes.get_last_error())
 
     ctx.progress.main_progress.console.print()
 
 
-def create_junction_dirs(ctx: Context_Progressed, /, kernel32: ctypes.WinDLL) -> None:
+def create_junction_dirs(ctx: Context_Progressed, /, kernel32: "ctypes.WinDLL") -> None:
     """
     Create junction directories (Windows / NTFS)
+
+    Junctions are created from thread pool, results are reported on main thread in original order
     """
 
-    for folder in ctx.junction_dirs:
-        attrs = folder.stat(follow_symlinks=False).st_file_attributes
-        folder_source = folder.readlink()
-        target_source = Path(ctx.destination, *folder_source.parts[ctx.len_source_parts :])
-        target = Path(ctx.destination, *folder.parts[ctx.len_source_parts :])
+    set_file_attributes = kernel32.SetFileAttributesW
+    source_str_len = len(str(ctx.source).rstrip(os.sep))
+    source_target_len = len(str(ctx.source).removeprefix("\\\\?\\").rstrip(os.sep))  # ? Source length in junction targets (w/o `\\?\` prefix)
+    destination_str = str(ctx.destination).rstrip(os.sep)
+
+    def create_junction(folder: Path, /) -> tuple[Path | None, str, OSError | None]:
+        target_source = None
+        target = destination_str + str(folder)[source_str_len:]
         # target = Path(f"{os.sep * 2}?{os.sep}{ctx.destination.parts[0]}", *ctx.destination.parts[1:], *folder_source.parts[len_source:])
 
         try:
-            create_junction_point(target_source, target)
-            copystat(folder, target)
-            kernel32.SetFileAttributesW(str(target), attrs)
+            attrs = folder.stat(follow_symlinks=False).st_file_attributes
+            # ? `readlink` of junction returns target with `\\?\` prefix, it's stripped so target is sliced same as source paths
+            target_source = Path(destination_str + str(folder.readlink()).removeprefix("\\\\?\\")[source_target_len:])
 
-            ctx.progress.main_progress.console.print(f"Created Junction point from {target_source!r} to {target!r}")
-            ctx.progress.main_progress.advance(ctx.progress.links, advance=1)
+            create_junction_point(target_source, Path(target))
+            copystat(folder, target)
+            set_file_attributes(target, attrs)
         except OSError as e:
-            ctx.oserrored.append(folder)
-            ctx.progress.main_progress.console.print("Junction creation error:", e, f"at {target!r}", style="red")
+            return target_source, target, e
+
+        return target_source, target, None
 
+    with ThreadPoolExecutor(max_workers=FIXUP_WORKERS) as executor:
+        for folder, (target_source, target, error) in zip(ctx.junction_dirs, executor.map(create_junction, ctx.junction_dirs), strict=True):
+            if error is None:
+                ctx.progress.main_progress.console.print(f"Created Junction point from {target_source!r} to {target!r}")
+                ctx.progress.main_progress.advance(ctx.progress.links, advance=1)
+            else:
+                ctx.oserrored.append(folder)
+                ctx.progress.main_progress.console.print("Junction creation error:", error, f"at {target!r}", style="red")
 
-def create_hardlinks_with_attributes(ctx: Context_Progressed, /, kernel32: ctypes.WinDLL) -> None:
+
+def create_hardlinks_with_attributes(ctx: Context_Progressed, /, kernel32: "ctypes.WinDLL | None" = None) -> None:
     """
-    Create hardlinks with attributes (Windows / NTFS)
+    Create hardlinks with attributes
+
+    Attributes are applied on Windows (NTFS) only, when `kernel32` is provided.
+    Links are created from thread pool, errors are reported on main thread, parent folders stats are restored once all links exist.
+    Already existing links (continued replication) are only reported, other errors are added to `oserrored`
     """
 
-    for _hl_source, hl_list in ctx.hardlinks.items():
-        for _hl in hl_list:
-            if _hl == _hl_source:
-                continue
+    set_file_attributes = kernel32.SetFileAttributesW if kernel32 is not None else None
+    source_str_len = len(str(ctx.source).rstrip(os.sep))
+    destination_str = str(ctx.destination).rstrip(os.sep)
 
-            try:
-                hl_source = Path(ctx.destination, *_hl_source.parts[ctx.len_source_parts :])
-                hl = Path(ctx.destination, *_hl.parts[ctx.len_source_parts :])
-                hl.hardlink_to(hl_source)
+    links = [
+        (destination_str + str(_hl_source)[source_str_len:], destination_str + str(_hl)[source_str_len:], _hl)
+        for _hl_source, hl_list in ctx.hardlinks.items()
+        for _hl in hl_list
+        if _hl != _hl_source
+    ]
 
+    def create_hardlink(link: tuple[str, str, Path], /) -> OSError | None:
+        hl_source, hl, _hl = link
+
+        try:
+            os.link(hl_source, hl)
+
+            if set_file_attributes is not None:
                 attrs = _hl.stat(follow_symlinks=False).st_file_attributes
-                kernel32.SetFileAttributesW(str(hl), attrs)
+                set_file_attributes(hl, attrs)
+        except OSError as e:
+            return e
 
-                ctx.progress.main_progress.advance(ctx.progress.links, advance=1)
-                ctx.progress.main_progress.console.print(f"Created hardlink from {hl_source!r} to {hl!r}")
-            except FileExistsError as e:
-                ctx.progress.main_progress.console.print("Hardlink creation error:", e)
+        return None
+
+    linked_parents: dict[str, Path] = {}
+    with ThreadPoolExecutor(max_workers=FIXUP_WORKERS) as executor:
+        for (hl_source, hl, _hl), error in zip(links, executor.map(create_hardlink, links), strict=True):
+            if isinstance(error, FileExistsError):
+                ctx.progress.main_progress.console.print("Hardlink creation error:", error)
+                continue
+            if error is not None:
+                ctx.oserrored.append(_hl)
+                ctx.progress.main_progress.console.print("Hardlink creation error:", error, style="red")
+                continue
+
+            linked_parents[os.path.dirname(hl)] = _hl.parent  # noqa: PTH120
+            ctx.progress.main_progress.advance(ctx.progress.links, advance=1)
+            ctx.progress.main_progress.console.print(f"Created hardlink from {hl_source!r} to {hl!r}")
+
+    for parent, _parent in linked_parents.items():
+        with contextlib.suppress(OSError):  # ? Restore folder modify date changed by new links
+            copystat(_parent, parent)
 
     ctx.progress.main_progress.console.print()
 
@@ -637,28 +1222,65 @@ def create_hardlinks_with_attributes(ctx: Context_Progressed, /, kernel32: ctype
 def write_progress_file_metadata(ctx: Context, /) -> None:
     """
     Write progress file metadata
+
+    All records are joined into one buffer and written at once
     """
 
+    records = (
+        orjson.dumps({"source": str(ctx.source), "destination": str(ctx.destination), "exclude": ctx.exclude}),
+        orjson.dumps({str(k): [str(p) for p in v] for k, v in ctx.hardlinks.items()}),
+        orjson.dumps([str(p) for p in ctx.extra_attrib_dirs]),
+        orjson.dumps([str(p) for p in ctx.junction_dirs]),
+        orjson.dumps({"dirs": ctx.list_dirs, "files": ctx.list_files, "links": ctx.list_links}),
+    )
+
     with progress_file.open(mode="ab") as f:
-        f.write(orjson.dumps({"source": str(ctx.source), "destination": str(ctx.destination), "exclude": list(ctx.exclude)}))
-        f.write(b"\n")
-        f.write(orjson.dumps({str(k): [str(p) for p in v] for k, v in ctx.hardlinks.items()}))
-        f.write(b"\n")
-        f.write(orjson.dumps([str(p) for p in ctx.extra_attrib_dirs]))
-        f.write(b"\n")
-        f.write(orjson.dumps([str(p) for p in ctx.junction_dirs]))
-        f.write(b"\n")
-        f.write(orjson.dumps({"dirs": list(ctx.list_dirs), "files": list(ctx.list_files), "links": list(ctx.list_links)}))
-        f.write(b"\n")
+        f.write(b"\n".join(records) + b"\n")
 
 
-def write_progress_file_processed(ctx: Context, /) -> None:
+def write_progress_file_processed(processed: queue.Queue[str | None], errors: list[OSError], /) -> None:
     """
     Write progress file processed
+
+    Runs in writer thread while copying, so progress survives a crash.
+    Queued paths are drained and written in batches every `PROCESSED_FLUSH_INTERVAL`, None stops the writer.
+    On write error (e.g. full drive) the error is stored to `errors` and queue is still drained, so copying never blocks on full queue
     """
 
-    with progress_file.open(mode="a", encoding="utf-8") as f:
-        f.writelines(p + "\n" for p in ctx.processed)
+    f: BinaryIO | None = None
+    try:
+        f = progress_file.open(mode="ab")
+    except OSError as e:
+        errors.append(e)
+
+    try:
+        while True:
+            batch = [processed.get()]
+            with contextlib.suppress(queue.Empty):
+                while batch[-1] is not None:
+                    batch.append(processed.get_nowait())
+
+            if stop := batch[-1] is None:
+                batch.pop()
+
+            if batch and f is not None:
+                try:
+                    f.write("\n".join(batch).encode("utf-8") + b"\n")
+                    f.flush()
+                except OSError as e:
+                    errors.append(e)
+                    with contextlib.suppress(OSError):
+                        f.close()
+                    f = None
+
+            if stop:
+                return
+
+            time.sleep(PROCESSED_FLUSH_INTERVAL)
+    finally:
+        if f is not None:
+            with contextlib.suppress(OSError):
+                f.close()
 
 
 def write_progress_file_oserrored(ctx: Context, /) -> None:
@@ -676,7 +1298,7 @@ def write_progress_file_oserrored(ctx: Context, /) -> None:
 # ? Main replication function
 
 
-def replication(source: Path, destination: Path, exclude: deque[str] | None = None, *, dir_exist_ok: bool = True) -> bool:
+def replication(source: Path, destination: Path, exclude: list[str] | None = None, *, dir_exist_ok: bool = True) -> bool:
     """
     Drive replication
     """
@@ -685,10 +1307,10 @@ def replication(source: Path, destination: Path, exclude: deque[str] | None = No
         source=source,
         destination=destination,
         exclude=(
-            deque(source.drive + os.sep + ex for ex in WINDOWS_DEFAULT_EXCLUDE) if not exclude else (exclude + deque(source.drive + os.sep + ex for ex in WINDOWS_DEFAULT_EXCLUDE))
+            [source.drive + os.sep + ex for ex in WINDOWS_DEFAULT_EXCLUDE] if not exclude else (exclude + [source.drive + os.sep + ex for ex in WINDOWS_DEFAULT_EXCLUDE])
         )
         if IS_WINDOWS
-        else (exclude or deque()),
+        else (exclude or []),
         len_source_parts=len(source.parts),
     )
 
@@ -716,8 +1338,8 @@ def replication(source: Path, destination: Path, exclude: deque[str] | None = No
     console.print("Total files:", ctx.total_files)
     console.print("Total links:", ctx.total_links)
     console.print(f"Total size: {ctx.total_size / (1024 ** 3):.2f} GB, {ctx.total_size} bytes")
-    if ctx.oserrored:
-        console.print("OS Errors:", ctx.oserrored, style="red")
+    if ctx.scan_errors:
+        print_scan_errors(ctx)
     console.print("\n──────────────────────────────────────────────────────────\n")
     console.print("Metadata collected. Start replication? (Ctrl+C to cancel)", style="italic")
     input()
@@ -732,18 +1354,14 @@ def replication(source: Path, destination: Path, exclude: deque[str] | None = No
         # //──────────────────────────────────────────────────────────
 
         if IS_WINDOWS and (ctx.extra_attrib_dirs or ctx.junction_dirs):
-            kernel32 = ctypes.WinDLL("kernel32.dll", use_last_error=True)
-
             apply_windows_attributes(ctx, kernel32=kernel32)
             create_junction_dirs(ctx, kernel32=kernel32)
-            create_hardlinks_with_attributes(ctx, kernel32=kernel32)
 
-        # TODO: else Linux hardlinks
+        if ctx.hardlinks:
+            create_hardlinks_with_attributes(ctx, kernel32=kernel32 if IS_WINDOWS else None)
 
         ctx.progress.main_progress.advance(ctx.progress.dirs, advance=1)
 
-    write_progress_file_processed(ctx)
-
     write_progress_file_oserrored(ctx)
 
     # console.print("\nProcessed:")
@@ -756,14 +1374,14 @@ def replication(source: Path, destination: Path, exclude: deque[str] | None = No
 def replication_continue(
     source: Path,
     destination: Path,
-    exclude: deque[str],
+    exclude: list[str],
     hardlinks: dict[Path, list[Path]],
-    extra_attrib_dirs: deque[Path],
-    junction_dirs: deque[Path],
-    list_dirs: deque[Path],
-    list_files: deque[Path],
-    list_links: deque[Path],
-    processed: deque[Path],
+    extra_attrib_dirs: list[Path],
+    junction_dirs: list[Path],
+    list_dirs: list[str],
+    list_files: list[str],
+    list_links: list[str],
+    processed: list[str],
 ) -> None:
     """
     Continuation of disrupted progress
@@ -781,24 +1399,24 @@ def main() -> None:  # noqa: C901
     """
 
     args = sys.argv[1:]
-    exclude = deque(args[2:])
+    exclude = args[2:]
 
     try:
         if progress_file.exists() and progress_file.stat().st_size > 0:
             console.print("Found previous session. Resume? (Y/yes/true/1 to continue)", style="italic")
             if confirm("> "):
-                with progress_file.open(mode="rb") as f:
-                    source_dest_exclude = orjson.loads(f.readline())
-                    source, dest, exclude = Path(source_dest_exclude["source"]), Path(source_dest_exclude["destination"]), source_dest_exclude["exclude"]
+                # ? Whole file is read at once, metadata records are 5 first lines, processed paths are decoded as one tail
+                *records, tail = progress_file.read_bytes().split(b"\n", 5)
+
+                source_dest_exclude = orjson.loads(records[0])
+                source, dest, exclude = Path(source_dest_exclude["source"]), Path(source_dest_exclude["destination"]), source_dest_exclude["exclude"]
 
-                    hardlinks = {Path(k): [Path(p) for p in v] for k, v in orjson.loads(f.readline()).items()}
-                    extra_attrib_dirs = deque(Path(p) for p in orjson.loads(f.readline()))
-                    junction_dirs = deque(Path(p) for p in orjson.loads(f.readline()))
-                    all_files = orjson.loads(f.readline())  # * {"dirs": [], "files": [], "links": []}
+                hardlinks = {Path(k): [Path(p) for p in v] for k, v in orjson.loads(records[1]).items()}
+                extra_attrib_dirs = [Path(p) for p in orjson.loads(records[2])]
+                junction_dirs = [Path(p) for p in orjson.loads(records[3])]
+                all_files = orjson.loads(records[4])  # * {"dirs": [], "files": [], "links": []}
 
-                    processed: deque[Path] = deque()
-                    for p in f.readlines():
-                        processed.append(Path(p.decode("utf-8")))
+                processed = tail.decode("utf-8").split("\n")[:-1]
 
                 replication_continue(
                     source=source,
@@ -817,7 +1435,7 @@ def main() -> None:  # noqa: C901
             print()
 
         # progress_file.unlink()
-        with progress_file.open(mode="w") as f:
+        with progress_file.open(mode="w"):
             pass
 
         if not args: